@@ -1,8 +1,8 @@
 import streamlit as st
 import requests
-import json
 from PIL import Image
 import os
+from jsonio import read_json, write_json
 
 st.title("📊 Excel to PowerPoint Converter")
 
@@ -21,17 +21,15 @@ if uploaded_file:
             ppt_format = st.file_uploader("Upload PPT Format (optional)", type=["pptx"])
 
             if st.button("🚀 Generate Presentation") and selected_cols:
-                input_json = {
-                    "uuid": job_id,
-                    "title": uploaded_file.name,
+                input_json_path = f"storage/uploads/{job_id}/input.json"
+                input_json = read_json(input_json_path)
+                input_json.update({
                     "theme": theme,
-                    "location": f"storage/uploads/{job_id}",
                     "input_pptx": "input.pptx" if ppt_format else None,
                     "important_columns": selected_cols
-                }
+                })
 
-                with open(f"storage/uploads/{job_id}/input.json", "w") as f:
-                    json.dump(input_json, f, indent=2)
+                write_json(input_json_path, input_json)
 
                 if ppt_format:
                     with open(f"storage/uploads/{job_id}/input.pptx", "wb") as f:
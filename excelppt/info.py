@@ -1,9 +1,15 @@
 import pandas as pd
 import os
+import importlib.util
+
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
 
 def extract_columns(upload_dir):
     for fname in os.listdir(upload_dir):
         if fname.startswith("input") and fname.endswith(".csv"):
-            df = pd.read_csv(os.path.join(upload_dir, fname))
+            df = pd.read_csv(os.path.join(upload_dir, fname), nrows=0)
+            return df.columns.tolist()
+        if fname.startswith("input") and fname.endswith(".xlsx"):
+            df = pd.read_excel(os.path.join(upload_dir, fname), engine=EXCEL_ENGINE, nrows=0)
             return df.columns.tolist()
     return []
\ No newline at end of file
@@ -0,0 +1,17 @@
+import os
+import orjson
+
+def read_json(path: str):
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+def write_json(path: str, data: dict):
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
\ No newline at end of file
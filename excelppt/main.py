@@ -1,10 +1,16 @@
-import os, json, uuid
+import os, uuid, shutil, asyncio, multiprocessing, threading
 from typing import Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from fastapi import FastAPI, UploadFile, File, Request, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from info import extract_columns
 from worker import generate_ppt
+from jsonio import read_json, write_json
 
 STORAGE_ROOT = "storage"
 UPLOADS_DIR = os.path.join(STORAGE_ROOT, "uploads")
@@ -12,7 +18,18 @@ OUTPUTS_DIR = os.path.join(STORAGE_ROOT, "outputs")
 os.makedirs(UPLOADS_DIR, exist_ok=True)
 os.makedirs(OUTPUTS_DIR, exist_ok=True)
 
-app = FastAPI(title="Excel→PPT Backend")
+def make_executor():
+    workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    max_workers = max(1, (os.cpu_count() or 1) // workers)
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.executor = make_executor()
+    yield
+    app.state.executor.shutdown()
+
+app = FastAPI(title="Excel→PPT Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,6 +42,12 @@ app.add_middleware(
 def job_dirs(job_id: str):
     return os.path.join(UPLOADS_DIR, job_id), os.path.join(OUTPUTS_DIR, job_id)
 
+def preview_path(job_id: str):
+    return os.path.join(OUTPUTS_DIR, job_id, "preview.json")
+
+def presentation_path(job_id: str):
+    return os.path.join(OUTPUTS_DIR, job_id, "presentation.pptx")
+
 @app.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
     ext = os.path.splitext(file.filename)[1].lower()
@@ -38,18 +61,18 @@ async def upload_file(file: UploadFile = File(...)):
 
     input_path = os.path.join(up_dir, f"input{ext}")
     with open(input_path, "wb") as f:
-        f.write(await file.read())
+        await run_in_threadpool(shutil.copyfileobj, file.file, f, 1 << 20)
 
     metadata = {
         "uuid": job_id,
         "title": file.filename,
         "location": up_dir,
+        "input_file": f"input{ext}",
         "important_columns": [],
         "theme": "Default",
         "input_pptx": None
     }
-    with open(os.path.join(up_dir, "input.json"), "w") as f:
-        json.dump(metadata, f, indent=2)
+    await run_in_threadpool(write_json, os.path.join(up_dir, "input.json"), metadata)
 
     return {"job_id": job_id, "filename": file.filename}
 
@@ -57,7 +80,7 @@ async def upload_file(file: UploadFile = File(...)):
 async def info_endpoint(req: Request):
     data = await req.json()
     uuid = data["uuid"]
-    upload_dir = os.path.join(UPLOADS_DIR, uuid)
+    upload_dir, _ = job_dirs(uuid)
     columns = extract_columns(upload_dir)
     return {"columns": columns}
 
@@ -65,16 +88,47 @@ async def info_endpoint(req: Request):
 async def generate_endpoint(req: Request):
     data = await req.json()
     uuid = data["uuid"]
-    generate_ppt(uuid)
+    executor = req.app.state.executor
+    try:
+        await asyncio.get_running_loop().run_in_executor(executor, generate_ppt, uuid)
+    except BrokenProcessPool:
+        if req.app.state.executor is executor:
+            req.app.state.executor = make_executor()
+        executor.shutdown(wait=False)
+        raise HTTPException(status_code=500, detail="Presentation generation failed.")
     return {"status": "success"}
 
+PREVIEW_CACHE_SIZE = 4096
+_preview_cache = OrderedDict()
+_preview_lock = threading.Lock()
+
+def load_preview(job_id: str):
+    path = preview_path(job_id)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        with _preview_lock:
+            _preview_cache.pop(job_id, None)
+        return None
+    key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    with _preview_lock:
+        cached = _preview_cache.get(job_id)
+        if cached and cached[0] == key:
+            _preview_cache.move_to_end(job_id)
+            return cached[1]
+    preview = read_json(path)
+    with _preview_lock:
+        _preview_cache[job_id] = (key, preview)
+        _preview_cache.move_to_end(job_id)
+        if len(_preview_cache) > PREVIEW_CACHE_SIZE:
+            _preview_cache.popitem(last=False)
+    return preview
+
 @app.get("/status/{job_id}")
 def job_status(job_id: str):
-    preview_path = os.path.join(OUTPUTS_DIR, job_id, "preview.json")
-    if not os.path.exists(preview_path):
+    preview = load_preview(job_id)
+    if preview is None:
         return {"status": "pending", "job_id": job_id}
-    with open(preview_path) as f:
-        preview = json.load(f)
     return {
         "status": "ready",
         "job_id": job_id,
@@ -83,9 +137,29 @@ def job_status(job_id: str):
         "download_url": f"/download/{job_id}"
     }
 
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
 @app.get("/download/{job_id}")
-def download(job_id: str):
-    ppt_path = os.path.join(OUTPUTS_DIR, job_id, "presentation.pptx")
-    if not os.path.exists(ppt_path):
+def download(job_id: str, req: Request):
+    ppt_path = presentation_path(job_id)
+    try:
+        stat = os.stat(ppt_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Presentation not found.")
-    return FileResponse(ppt_path, media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation", filename=f"presentation_{job_id}.pptx")
\ No newline at end of file
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=300"}
+    if etag_matches(req.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(ppt_path, media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation", filename=f"presentation_{job_id}.pptx", headers=headers, stat_result=stat)
+
+if __name__ == "__main__":
+    import uvicorn
+    os.environ.setdefault("WEB_CONCURRENCY", str(os.cpu_count() or 1))
+    uvicorn.run("main:app", port=8000, workers=int(os.environ["WEB_CONCURRENCY"]))
\ No newline at end of file
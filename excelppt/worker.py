@@ -1,4 +1,5 @@
-import os, json
+import os
+from jsonio import read_json
 # from presentation import create_ppt  # your external logic
 
 def generate_ppt(uuid):
@@ -7,11 +8,12 @@ def generate_ppt(uuid):
     os.makedirs(output_dir, exist_ok=True)
 
     input_json_path = os.path.join(upload_dir, "input.json")
-    with open(input_json_path) as f:
-        config = json.load(f)
+    config = read_json(input_json_path)
 
-    input_csv = next((f for f in os.listdir(upload_dir) if f.startswith("input") and f.endswith(".csv")), None)
-    if not input_csv:
+    input_csv = config.get("input_file")
+    if input_csv is None:
+        input_csv = next((f for f in os.listdir(upload_dir) if f.startswith("input") and f.endswith(".csv")), None)
+    if not input_csv or not input_csv.endswith(".csv"):
         return
 
     input_csv_path = os.path.join(upload_dir, input_csv)